@@ -3,8 +3,10 @@
 
 from __future__ import annotations
 from argparse import ArgumentParser, Namespace
-from dataclasses import dataclass
+from array import array
 from enum import Enum, auto
+from itertools import chain
+from operator import sub
 from os import linesep
 from random import sample
 from string import digits, ascii_lowercase
@@ -36,11 +38,63 @@ __all__ = [
 
 NUM_TO_STR = dict(enumerate(digits + ascii_lowercase))
 STR_TO_NUM = {value: key for key, value in NUM_TO_STR.items()}
+NEIGHBOR_DELTAS = (
+    (-1, -1),
+    (0, -1),
+    (1, -1),
+    (-1, 0),
+    (1, 0),
+    (-1, 1),
+    (0, 1),
+    (1, 1),
+)
 USAGE = """Visit fields:
     $ <x> <y>
 
 Toggle flags:
     $ ? <x> <y>"""
+# Bits of a cell's state.
+# The bits from COUNT_SHIFT on hold the amount of neighboring mines.
+MINE = 0b001
+FLAGGED = 0b010
+VISITED = 0b100
+COUNT_SHIFT = 3
+COUNT_GLYPHS = " 12345678"
+
+
+def _window_sums(values: Iterable[int]) -> list[int]:
+    """Return the sums of each value and its direct neighbors."""
+    padded = [0, *values, 0]
+    return list(map(sum, zip(padded, padded[1:], padded[2:])))
+
+
+def _cell_glyph(state: int, game_over: bool) -> str:
+    """Return the glyph of a cell in the given state."""
+    mine = state & MINE
+
+    if state & FLAGGED:
+        return "?" if not game_over else ("!" if mine else "x")
+
+    if mine and state & VISITED:
+        return "*"
+
+    if mine and game_over:
+        return "o"
+
+    if not mine and (state & VISITED or game_over):
+        return COUNT_GLYPHS[state >> COUNT_SHIFT]
+
+    return "■"
+
+
+PLAYING_GLYPHS = tuple(
+    _cell_glyph(state, game_over=False)
+    for state in range(len(COUNT_GLYPHS) << COUNT_SHIFT)
+)
+GAME_OVER_GLYPHS = tuple(
+    _cell_glyph(state, game_over=True)
+    for state in range(len(COUNT_GLYPHS) << COUNT_SHIFT)
+)
 
 
 class ReturnCode(int, Enum):
@@ -83,46 +137,61 @@ class Vector2D(NamedTuple):
     def from_strings(cls, strings: Iterable[str]) -> Vector2D:
         """Creates a coordinate from an iterable of strings."""
         try:
-            return cls(*map(lambda pos: STR_TO_NUM[pos], strings))
+            return cls(*map(STR_TO_NUM.__getitem__, strings))
         except KeyError as error:
             raise ValueError(f"Invalid coordinate value: {error}") from None
         except TypeError:
             raise ValueError("Expect two coordinates: x and y") from None
 
     @property
-    def neighbors(self) -> Iterator[Vector2D]:
-        """Yield coordinates surrounding this position."""
-        for delta_y in range(-1, 2):
-            for delta_x in range(-1, 2):
-                if delta_x == delta_y == 0:
-                    continue  # Skip the current position itself.
+    def neighbors(self) -> list[Vector2D]:
+        """Return coordinates surrounding this position."""
+        return [
+            Vector2D(self.x + delta_x, self.y + delta_y)
+            for delta_x, delta_y in NEIGHBOR_DELTAS
+        ]
 
-                yield Vector2D(self.x + delta_x, self.y + delta_y)
 
+class Cell(NamedTuple):
+    """A view on a cell of a minefield."""
 
-@dataclass
-class Cell:
-    """A cell of a minefield."""
+    # pylint: disable=W0212
 
+    minefield: Minefield
     position: Vector2D
-    mine: Optional[bool] = None
-    flagged: bool = False
-    visited: bool = False
+
+    @property
+    def _index(self) -> int:
+        """Returns the index of the cell in the minefield's arrays."""
+        return self.minefield._index(self.position)
+
+    @property
+    def mine(self) -> Optional[bool]:
+        """Returns whether the cell is a mine or None if uninitialized."""
+        if not self.minefield._initialized:
+            return None
+
+        return bool(self.minefield._state[self._index] & MINE)
+
+    @property
+    def flagged(self) -> bool:
+        """Returns whether the cell is flagged."""
+        return bool(self.minefield._state[self._index] & FLAGGED)
+
+    @property
+    def visited(self) -> bool:
+        """Returns whether the cell has been visited."""
+        return bool(self.minefield._state[self._index] & VISITED)
 
     def toggle_flag(self) -> None:
         """Toggles the flag on this field."""
-        if self.visited:
-            return
+        self.minefield.toggle_flag(self.position)
 
-        self.flagged = not self.flagged
 
-
-class Minefield:
+class Minefield:  # pylint: disable=R0902
     """A minefield."""
 
     def __init__(self, width: int, height: int, mines: int):
-        super().__init__()
-
         if width < 1 or height < 1:
             raise ValueError("Field is too small.")
 
@@ -136,9 +205,25 @@ class Minefield:
             raise ValueError("Too many mines for mine field.")
 
         self.mines = mines
-        self._grid = [
-            [Cell(Vector2D(x, y)) for x in range(width)] for y in range(height)
+        self._width = width
+        self._height = height
+        # Per-cell data is kept in flat arrays, indexed by y * width + x.
+        # Cell states are bit fields of MINE, FLAGGED, VISITED and the count.
+        self._state = bytearray(size := width * height)
+        # Region 0 denotes cells that are not part of any region.
+        self._regions = array("H", [0]) * size
+        self._region_cells: list[list[int]] = [[]]
+        # The field's size never changes, so neither do the cells' neighbors.
+        self._neighbor_indices = [
+            tuple(map(self._index, filter(self.__contains__, position.neighbors)))
+            for position in map(self._position, range(size))
         ]
+        # Neither do the labels of the table's columns and rows.
+        columns = " ".join(NUM_TO_STR[index] for index in range(width))
+        self._header = (f" |{columns}| ", "".join(["-+", "-" * (width * 2 - 1), "+-"]))
+        self._row_prefixes = [NUM_TO_STR[index] for index in range(height)]
+        self._initialized = False
+        self._unvisited_safe_cells = size - mines
         self._result = None
 
     def __str__(self) -> str:
@@ -147,54 +232,49 @@ class Minefield:
 
     def __iter__(self) -> Iterator[Cell]:
         """Yields all cells of the minefield."""
-        return (cell for row in self._grid for cell in row)
+        return (Cell(self, self._position(index)) for index in range(len(self._state)))
 
     def __contains__(self, item: Union[Cell, Vector2D]) -> bool:
-        if isinstance(item, Cell):
-            return item.position in self
+        if isinstance(item, Vector2D):
+            return 0 <= item.x < self._width and 0 <= item.y < self._height
 
-        return 0 <= item.x < self.width and 0 <= item.y < self.height
+        return (
+            isinstance(item, Cell) and item.minefield is self and item.position in self
+        )
 
     def __getitem__(self, position: Vector2D) -> Cell:
         """Returns the cell at the given position."""
         if position in self:
-            return self._grid[position.y][position.x]
+            return Cell(self, position)
 
         raise IndexError(position)
 
     @property
-    def _header(self) -> Iterator[str]:
-        """Returns the table header."""
-        row = " ".join(NUM_TO_STR[index] for index in range(self.width))
-        yield f" |{row}| "
-        yield "".join(["-+", "-" * (self.width * 2 - 1), "+-"])
-
-    @property
-    def _lines(self) -> Iterator[str]:
-        """Yield lines of the str representation."""
-        yield from (header := list(self._header))
-
-        for pos_y, row in enumerate(self._grid):
-            prefix = NUM_TO_STR[pos_y]
-            row = " ".join(self._cell_to_str(cell) for cell in row)
-            yield f"{prefix}|{row}|{prefix}"
-
-        yield from reversed(header)
-
-    @property
-    def _uninitialized(self) -> bool:
-        """Check whether all cells are uninitialized."""
-        return all(cell.mine is None for cell in self)
+    def _lines(self) -> list[str]:
+        """Return lines of the str representation."""
+        lines = list(self._header)
+        glyphs = PLAYING_GLYPHS if self._result is None else GAME_OVER_GLYPHS
+        state, width = self._state, self._width
+
+        for pos_y, prefix in enumerate(self._row_prefixes):
+            offset = pos_y * width
+            row = " ".join(
+                [glyphs[state[index]] for index in range(offset, offset + width)]
+            )
+            lines.append(f"{prefix}|{row}|{prefix}")
+
+        lines.extend(reversed(self._header))
+        return lines
 
     @property
-    def _uninitialized_cells(self) -> list[Cell]:
-        """Yield cells that have not been initialized."""
-        return [cell for cell in self if cell.mine is None]
+    def _swept(self) -> bool:
+        """Check whether all safe cells have been visited."""
+        return not self._unvisited_safe_cells
 
     @property
     def flags(self) -> int:
         """Returns the amount of placed flags."""
-        return sum(cell.flagged for cell in self)
+        return sum(bool(state & FLAGGED) for state in self._state)
 
     @property
     def remaining_mines(self) -> int:
@@ -204,118 +284,208 @@ class Minefield:
     @property
     def width(self) -> int:
         """Returns the width of the field."""
-        return len(self._grid[0])
+        return self._width
 
     @property
     def height(self) -> int:
         """Returns the height of the field."""
-        return len(self._grid)
+        return self._height
 
-    def _neighbors(self, position: Vector2D) -> Iterator[Cell]:
-        """Yield cells surrounding the given position."""
-        return filter(None, map(self.get, position.neighbors))
+    def _index(self, position: Vector2D) -> int:
+        """Return the array index of the given position."""
+        return position.y * self._width + position.x
 
-    def _unvisited_neighbors(self, position: Vector2D) -> Iterator[Cell]:
-        """Yield cells surrounding the given position that are unvisited."""
-        return filter(lambda cell: not cell.visited, self._neighbors(position))
+    def _position(self, index: int) -> Vector2D:
+        """Return the position of the given array index."""
+        pos_y, pos_x = divmod(index, self._width)
+        return Vector2D(pos_x, pos_y)
 
-    def _neighboring_mines(self, position: Vector2D) -> int:
-        """Return the amount of mines surrounding the given position."""
-        return sum(cell.mine for cell in self._neighbors(position))
+    def _neighbors(self, index: int) -> tuple[int, ...]:
+        """Return indices of the cells surrounding the given cell."""
+        return self._neighbor_indices[index]
 
-    def _neighboring_flags(self, position: Vector2D) -> int:
-        """Return the amount of flags surrounding the given position."""
-        return sum(cell.flagged for cell in self._neighbors(position))
+    def _unvisited_neighbors(self, index: int) -> Iterator[int]:
+        """Yield indices of the cells surrounding the given cell that are unvisited."""
+        return filter(
+            lambda nbr: not self._state[nbr] & VISITED, self._neighbors(index)
+        )
+
+    def _neighboring_mines(self, index: int) -> int:
+        """Return the amount of mines surrounding the given cell."""
+        return self._state[index] >> COUNT_SHIFT
+
+    def _neighboring_flags(self, index: int) -> int:
+        """Return the amount of flags surrounding the given cell."""
+        return sum(
+            bool(self._state[neighbor] & FLAGGED) for neighbor in self._neighbors(index)
+        )
 
-    def _remaining_neighboring_mines(self, position: Vector2D) -> int:
+    def _remaining_neighboring_mines(self, index: int) -> int:
         """Return the amount of remaining mines
-        surrounding the given position.
+        surrounding the given cell.
+        """
+        return max([0, self._neighboring_mines(index) - self._neighboring_flags(index)])
+
+    def _initialize(self, start: int) -> None:
+        """Initialize the minefield."""
+        for index in sample(range(len(self._state) - 1), k=self.mines):
+            # Skip the start index to ensure that we do
+            # not step on a mine on our first visit.
+            self._state[index + (index >= start)] |= MINE
+
+        self._count_neighboring_mines()
+        self._label_regions()
+        self._initialized = True
+
+    def _count_neighboring_mines(self) -> None:
+        """Count the mines surrounding each cell
+        as the 3x3 box sum around it minus the cell itself.
+        """
+        mines = [state & MINE for state in self._state]
+        rows = [
+            _window_sums(mines[offset : offset + self._width])
+            for offset in range(0, len(mines), self._width)
+        ]
+        columns = [_window_sums(column) for column in zip(*rows)]
+        counts = map(sub, chain.from_iterable(zip(*columns)), mines)
+
+        for index, count in enumerate(counts):
+            self._state[index] |= count << COUNT_SHIFT
+
+    def _label_regions(self) -> None:
+        """Label connected regions of safe cells without neighboring mines
+        and collect the cells to visit for each region including its border.
+        """
+        for start in range(len(self._state)):
+            if self._empty(start) and not self._regions[start]:
+                self._label_region(start, len(self._region_cells))
+
+    def _label_region(self, start: int, region: int) -> None:
+        """Label the region of the given empty cell by filling
+        horizontal spans and seeding the spans of the adjacent rows.
         """
-        return max(
-            [0, self._neighboring_mines(position) - self._neighboring_flags(position)]
+        regions, width, unlabeled_empty = (
+            self._regions,
+            self._width,
+            self._unlabeled_empty,
         )
+        cells = set()
+        stack = [start]
 
-    def _cell_to_str(self, cell: Cell) -> str:
-        """Return a str representation of the cell."""
-        if cell.flagged:
-            return "?" if self._result is None else ("!" if cell.mine else "x")
+        while stack:
+            if regions[index := stack.pop()]:
+                continue
 
-        if cell.mine and cell.visited:
-            return "*"
+            row_start = index - index % width
+            row_end = row_start + width - 1
+            left = right = index
 
-        if cell.mine and self._result is not None:
-            return "o"
+            while left > row_start and unlabeled_empty(left - 1):
+                left -= 1
 
-        if not cell.mine and (cell.visited or self._result is not None):
-            if surrounding_mines := self._neighboring_mines(cell.position):
-                return str(surrounding_mines)
+            while right < row_end and unlabeled_empty(right + 1):
+                right += 1
 
-            return " "
+            regions[left : right + 1] = array("H", [region]) * (right - left + 1)
+            # The span's border extends diagonally into the adjacent rows.
+            left, right = max(left - 1, row_start), min(right + 1, row_end)
 
-        return "■"
+            for offset in (-width, 0, width):
+                if 0 <= row_start + offset < len(regions):
+                    span = range(left + offset, right + offset + 1)
+                    cells.update(span)
+                    stack.extend(filter(unlabeled_empty, span))
 
-    def _initialize(self, start: Vector2D) -> None:
-        """Initialize the minefield."""
-        # Ensure that we do not step on a mine on our first visit.
-        self[start].mine = False
+        self._region_cells.append(list(cells))
 
-        for cell in sample(self._uninitialized_cells, k=self.mines):
-            cell.mine = True
+    def _empty(self, index: int) -> bool:
+        """Check whether the given cell is safe and has no neighboring mines."""
+        return not self._state[index] & MINE and not self._neighboring_mines(index)
 
-        for cell in self._uninitialized_cells:
-            cell.mine = False
+    def _unlabeled_empty(self, index: int) -> bool:
+        """Check whether the given cell is empty and not yet part of a region."""
+        return not self._regions[index] and self._empty(index)
 
     def _end_game(self, result: GameOver) -> None:
         """Ends the game."""
         self._result = result
         raise result
 
-    def _visit_cell(self, cell: Cell) -> None:
+    def _visit_cell(self, index: int) -> None:
         """Visits the given cell."""
-        if cell.visited or cell.flagged:
+        if self._state[index] & (VISITED | FLAGGED):
             return
 
-        cell.visited = True
+        self._state[index] |= VISITED
 
-        if cell.mine:
+        if self._state[index] & MINE:
             self._end_game(GameOver.LOST)
-        elif all(cell.visited for cell in self if not cell.mine):
-            self._end_game(GameOver.WON)
 
-    def _visit_neighbors(self, position: Vector2D) -> None:
-        """Visits the neighbors of the given position."""
-        unvisited = list(self._unvisited_neighbors(position))
+        self._unvisited_safe_cells -= 1
 
-        while unvisited:
-            self._visit_cell(cell := unvisited.pop())
+    def _visit_neighbors(self, index: int) -> None:
+        """Visits the neighbors of the given cell."""
+        regions = set()
 
-            if cell.flagged or self._neighboring_mines(cell.position):
-                continue
+        for neighbor in self._unvisited_neighbors(index):
+            self._visit_cell(neighbor)
+
+            if not self._state[neighbor] & FLAGGED:
+                regions.add(self._regions[neighbor])
+
+        regions.discard(0)
+
+        for region in regions:
+            self._visit_region(region)
 
-            unvisited.extend(self._unvisited_neighbors(cell.position))
+    def _visit_region(self, region: int) -> None:
+        """Visits all unflagged cells of the given region."""
+        state = self._state
+        visited = 0
+
+        for index in self._region_cells[region]:
+            if not state[index] & (VISITED | FLAGGED):
+                state[index] |= VISITED
+                visited += 1
+
+        self._unvisited_safe_cells -= visited
 
     def get(self, position: Vector2D) -> Optional[Cell]:
         """Returns the cell at the given coordinate,
         if is on the minefield or else None.
         """
-        return self._grid[position.y][position.x] if position in self else None
+        return Cell(self, position) if position in self else None
 
     def toggle_flag(self, position: Vector2D) -> None:
         """Toggles the marker on the given cell."""
-        self[position].toggle_flag()
+        if position not in self:
+            raise IndexError(position)
+
+        if self._state[index := self._index(position)] & VISITED:
+            return
+
+        self._state[index] ^= FLAGGED
 
     def visit(self, position: Vector2D) -> None:
         """Visit the cell at the given position."""
         if self._result is not None:
             raise self._result
 
-        if self._uninitialized:
-            self._initialize(position)
+        if position not in self:
+            raise IndexError(position)
+
+        index = self._index(position)
 
-        self._visit_cell(self[position])
+        if not self._initialized:
+            self._initialize(index)
 
-        if not self._remaining_neighboring_mines(position):
-            self._visit_neighbors(position)
+        self._visit_cell(index)
+
+        if not self._remaining_neighboring_mines(index):
+            self._visit_neighbors(index)
+
+        if self._swept:
+            self._end_game(GameOver.WON)
 
 
 class ActionType(int, Enum):
@@ -334,11 +504,15 @@ class Action(NamedTuple):
     @classmethod
     def from_strings(cls, items: list[str]) -> Action:
         """Creates an action from a list of strings."""
-        coordinates = [item for item in items if item in STR_TO_NUM.keys()]
+        coordinates, actions = [], []
+
+        for item in items:
+            (coordinates if item in STR_TO_NUM else actions).append(item)
+
         position = Vector2D.from_strings(coordinates)
 
         try:
-            action, *excess = filter(lambda i: i not in coordinates, items)
+            action, *excess = actions
         except ValueError:
             return cls(ActionType.VISIT, position)
 